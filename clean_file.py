@@ -1,13 +1,40 @@
+import os
+import shutil
+
+CHUNK_SIZE = 1 << 20
+
+def _contains_null(filepath, buf):
+    with open(filepath, 'rb', buffering=0) as src:
+        while n := src.readinto(buf):
+            # find() bounded to n searches the buffer in place (memchr) without slicing a copy
+            if buf.find(b'\x00', 0, n) != -1:
+                return True
+    return False
+
 def clean_file(filepath):
-    with open(filepath, 'rb') as f:
-        content = f.read()
-    
-    # Remove null bytes
-    clean_content = content.replace(b'\x00', b'')
-    
-    # Write back
-    with open(filepath, 'wb') as f:
-        f.write(clean_content)
+    buf = bytearray(CHUNK_SIZE)
+
+    # Nothing to strip, so leave the file untouched
+    if not _contains_null(filepath, buf):
+        return
+
+    tmp_path = filepath + '.tmp'
+    try:
+        with open(filepath, 'rb', buffering=0) as src, open(tmp_path, 'wb', buffering=CHUNK_SIZE) as dst:
+            # Remove null bytes one chunk at a time, reusing the same read buffer
+            while n := src.readinto(buf):
+                dst.write((buf if n == CHUNK_SIZE else buf[:n]).translate(None, b'\x00'))
+
+        # Keep the original permissions, then swap the cleaned copy into place
+        shutil.copymode(filepath, tmp_path)
+        os.replace(tmp_path, filepath)
+    except:
+        # Don't leave a half-written temp file behind
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 if __name__ == '__main__':
     clean_file('data_wiping_tool/gui.py')
@@ -1,7 +1,11 @@
 import uuid, time, platform, os, psutil
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.units import mm
+from reportlab.lib.utils import ImageReader
+from .utils import json_dumps
 try:
     import qrcode
     from PIL import Image
@@ -9,6 +13,35 @@ try:
 except Exception:
     QR_AVAILABLE = False
 
+# QR encoding runs here so it overlaps with drawing the text pages
+_QR_POOL = ThreadPoolExecutor(max_workers=1)
+
+# Mount topology rarely changes mid-session, so reuse the mountpoint index briefly
+_PART_CACHE_TTL = 5.0
+_PART_CACHE = {'t': 0.0, 'v': None}
+
+def _get_mountpoint_index():
+    """Return {mountpoint: partition} from psutil.disk_partitions(), cached for a few seconds"""
+    now = time.monotonic()
+    if _PART_CACHE['v'] is None or now - _PART_CACHE['t'] >= _PART_CACHE_TTL:
+        index = {}
+        for partition in psutil.disk_partitions(all=False):
+            # Keep the first entry for a mountpoint, as the old linear scan did
+            index.setdefault(partition.mountpoint, partition)
+        _PART_CACHE['v'] = index
+        _PART_CACHE['t'] = now
+    return _PART_CACHE['v']
+
+def _build_qr_png_bytes(data):
+    """Encode data as a QR code and return the image as PNG bytes"""
+    qr = qrcode.QRCode(version=1, box_size=10, border=5)
+    qr.add_data(data)
+    qr.make(fit=True)
+    img = qr.make_image(fill_color="black", back_color="white")
+    bio = BytesIO()
+    img.save(bio, format='PNG')
+    return bio.getvalue()
+
 def generate_certificate(output_path, payload: dict):
     cert_id = str(uuid.uuid4())
     issued_at = time.strftime('%Y-%m-%d %H:%M:%S %Z', time.localtime())
@@ -33,15 +66,13 @@ def generate_certificate(output_path, payload: dict):
             }
         else:
             # Try to get partition info
-            partitions = psutil.disk_partitions()
-            for partition in partitions:
-                if partition.mountpoint == target_path:
-                    drive_info = {
-                        'device': partition.device,
-                        'fstype': partition.fstype,
-                        'drive_type': 'Partition'
-                    }
-                    break
+            partition = _get_mountpoint_index().get(target_path)
+            if partition is not None:
+                drive_info = {
+                    'device': partition.device,
+                    'fstype': partition.fstype,
+                    'drive_type': 'Partition'
+                }
     except:
         pass
     
@@ -52,84 +83,77 @@ def generate_certificate(output_path, payload: dict):
         'drive_info': drive_info,
     }
     payload = {**payload, **meta}
+    
+    # Build the QR code (only essential data) while the text pages are being drawn
+    qr_future = None
+    if QR_AVAILABLE:
+        essential_data = {
+            'certificate_id': payload['certificate_id'],
+            'issued_at': payload['issued_at'],
+            'target': payload['target'],
+            'method': payload['method']
+        }
+        qr_future = _QR_POOL.submit(_build_qr_png_bytes, json_dumps(essential_data))
+    
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
     c = canvas.Canvas(output_path, pagesize=A4)
     width, height = A4
-    c.setFont('Helvetica-Bold', 18)
-    c.drawString(25*mm, height-30*mm, 'Certificate of Secure Data Erasure')
-    c.setFont('Helvetica', 11)
-    y = height-45*mm
-    def line(txt, dy=7*mm):
-        nonlocal y
-        c.drawString(25*mm, y, txt)
-        y -= dy
-    line(f'Certificate ID: {cert_id}')
-    line(f'Issued At: {issued_at}')
-    line(f'Target: {payload.get("target")}')
-    line(f'Method: {payload.get("method")}')
-    line(f'Verified: {payload.get("verified")}')
+    # Collect the summary lines first so each page block is emitted with one font change
+    lines = [
+        f'Certificate ID: {cert_id}',
+        f'Issued At: {issued_at}',
+        f'Target: {payload.get("target")}',
+        f'Method: {payload.get("method")}',
+        f'Verified: {payload.get("verified")}',
+    ]
     
     # Device information
     device_info = payload.get('device_info', {})
     if device_info:
-        line(f'Device: {device_info.get("hostname", "Unknown")}')
-        line(f'System: {device_info.get("system", "Unknown")}')
+        lines.append(f'Device: {device_info.get("hostname", "Unknown")}')
+        lines.append(f'System: {device_info.get("system", "Unknown")}')
     
     # Drive information
     drive_info = payload.get('drive_info', {})
     if drive_info:
         if 'drive_letter' in drive_info:
-            line(f'Drive: {drive_info["drive_letter"]} ({drive_info.get("drive_type", "Unknown")})')
+            lines.append(f'Drive: {drive_info["drive_letter"]} ({drive_info.get("drive_type", "Unknown")})')
         elif 'device' in drive_info:
-            line(f'Device: {drive_info["device"]} ({drive_info.get("fstype", "Unknown")})')
+            lines.append(f'Device: {drive_info["device"]} ({drive_info.get("fstype", "Unknown")})')
     
     results = payload.get('results')
     if isinstance(results, list):
-        line(f'Items Processed: {len(results)}')
+        lines.append(f'Items Processed: {len(results)}')
     elif isinstance(results, dict) and 'total_files_processed' in results:
-        line(f'Files Processed: {results["total_files_processed"]}')
+        lines.append(f'Files Processed: {results["total_files_processed"]}')
     else:
-        line('Items Processed: 1')
-    c.showPage()
-    c.setFont('Courier', 9)
-    c.drawString(20*mm, height-20*mm, 'Erasure Metadata (JSON)')
-    from reportlab.platypus import Preformatted, Frame
-    from reportlab.lib.styles import getSampleStyleSheet
-    import json
-    styles = getSampleStyleSheet()
-    text = json.dumps(payload, indent=2)
-    frame = Frame(15*mm, 15*mm, width-30*mm, height-40*mm, showBoundary=0)
-    pre = Preformatted(text, styles['Code'])
-    frame.addFromList([pre], c)
-    if QR_AVAILABLE:
+        lines.append('Items Processed: 1')
+    
+    c.setFont('Helvetica-Bold', 18)
+    c.drawString(25*mm, height-30*mm, 'Certificate of Secure Data Erasure')
+    summary = c.beginText(25*mm, height-45*mm)
+    summary.setFont('Helvetica', 11, leading=7*mm)
+    summary.textLines(lines)
+    c.drawText(summary)
+    # Plain monospaced JSON lines, paginated by hand; each line is decoded only when drawn
+    json_lines = json_dumps(payload, indent=True).splitlines()
+    lines_per_page = int((height-43*mm) // 8.8) + 1
+    for start in range(0, len(json_lines), lines_per_page):
+        c.showPage()
+        c.setFont('Courier', 9)
+        c.drawString(20*mm, height-20*mm, 'Erasure Metadata (JSON)')
+        body = c.beginText(20*mm, height-28*mm)
+        body.setFont('Courier', 8, leading=8.8)
+        for ln in json_lines[start:start + lines_per_page]:
+            body.textLine(ln.decode('utf-8', 'replace'))
+        c.drawText(body)
+    if qr_future is not None:
         # Start a new page for the QR code
         c.showPage()
         c.setFont('Helvetica', 12)
         c.drawString(25*mm, height-30*mm, 'Scan QR for Certificate Metadata')
-        # Generate a QR code image with only essential data
-        essential_data = {
-            'certificate_id': payload['certificate_id'],
-            'issued_at': payload['issued_at'],
-            'target': payload['target'],
-            'method': payload['method']
-        }
-        qr = qrcode.QRCode(version=1, box_size=10, border=5)
-        qr.add_data(json.dumps(essential_data))
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        
-        # Save the image to a temporary file
-        temp_path = os.path.join(os.path.dirname(output_path), f'temp_qr_{cert_id}.png')
-        img.save(temp_path)
-        
-        # Draw the QR code on the page
-        c.drawImage(temp_path, 25*mm, height-130*mm, 80*mm, 80*mm)
-        
-        # Clean up temporary file
-        try:
-            os.remove(temp_path)
-        except:
-            pass
+        # Draw the QR code built alongside the text pages
+        c.drawImage(ImageReader(BytesIO(qr_future.result())), 25*mm, height-130*mm, 80*mm, 80*mm)
             
     c.save()
     return {'certificate_id': cert_id, 'path': output_path}
@@ -1,6 +1,7 @@
-import argparse, json, os
+import argparse, os, sys
 from .wipe import wipe_file, wipe_folder
 from .cert import generate_certificate
+from .utils import json_dumps
 
 def main():
     p = argparse.ArgumentParser(description='Data Wiping Tool (CLI)')
@@ -20,10 +21,12 @@ def main():
     payload = {
         'target': target,
         'method': args.method,
-        'verified': (result.get('verified_changed', True) if isinstance(result, dict) else all([r.get('verified_changed', True) for r in result if 'verified_changed' in r])),
+        'verified': (result.get('verified_changed', True) if isinstance(result, dict) else all(r.get('verified_changed', True) for r in result if 'verified_changed' in r)),
         'results': result,
     }
-    print(json.dumps(payload, indent=2))
+    sys.stdout.flush()
+    sys.stdout.buffer.write(json_dumps(payload, indent=True) + b'\n')
+    sys.stdout.buffer.flush()
     if args.cert_out:
         info = generate_certificate(args.cert_out, payload)
         print(f"Certificate saved to {info['path']}")
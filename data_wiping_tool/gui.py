@@ -1,24 +1,63 @@
 ﻿import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import threading, os, time, platform
+import threading, os, sys, time, collections
+from concurrent.futures import ProcessPoolExecutor
 from .wipe import wipe_file, wipe_folder, wipe_drive, get_available_drives, WipeError, optimized_wipe_drive, get_optimized_method_info
 from .cert import generate_certificate
 from .logger import WipeLogger
 
 APP_TITLE = "Data Wiping Tool"
 LICENSE_TEXT = "Licensed to Aniket Tegginamath"
+_IS_WIN = sys.platform.startswith('win')
+CERT_DIR = os.path.join(os.path.expanduser('~'), 'DataWipingCertificates')
+# Certificates are rendered out of process so the GUI is free as soon as the wipe ends
+_CERT_POOL = None
+
+def _cert_pool() -> ProcessPoolExecutor:
+    """Start the certificate worker process on first use"""
+    global _CERT_POOL
+    if _CERT_POOL is None:
+        _CERT_POOL = ProcessPoolExecutor(max_workers=1)
+    return _CERT_POOL
+
+def _is_drive_path(p: str) -> bool:
+    """True for a Windows drive root such as C:\\"""
+    return _IS_WIN and len(p) == 3 and p[1] == ':' and p[2] == '\\'
 
 class App(tk.Tk):
+    _styles_built = False
+
     def __init__(self):
         super().__init__()
         self.title(APP_TITLE)
         self.geometry('720x540')
         self.configure(bg='#0f172a')
         self.logger = WipeLogger()
+        self._log_queue = collections.deque()
+        self._cert_jobs = collections.deque()
+        self._drive_cache = (0.0, None)
         self._build_style()
         self._build_ui()
+        self.protocol('WM_DELETE_WINDOW', self._on_close)
+        self.after(100, self._flush_log)
+        self.after(200, self._poll_certs)
+
+    def _on_close(self):
+        """Stop the certificate worker before tearing down the window"""
+        global _CERT_POOL
+        if _CERT_POOL is not None:
+            # shutdown(cancel_futures=True) is 3.9+; cancel what is still queued by hand
+            for job in self._cert_jobs:
+                job[0].cancel()
+            _CERT_POOL.shutdown(wait=False)
+            _CERT_POOL = None
+        self.destroy()
 
     def _build_style(self):
+        # Theme settings are process-wide; configure them only once
+        if App._styles_built:
+            return
+        App._styles_built = True
         style = ttk.Style(self)
         try:
             style.theme_use('clam')
@@ -78,10 +117,12 @@ class App(tk.Tk):
         progress_frame.grid(row=7, column=0, columnspan=3, sticky='we', pady=(0, pad))
         progress_frame.columnconfigure(0, weight=1)
         
-        self.progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=100)
+        self.progress_var = tk.DoubleVar(value=0)
+        self.progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=100, variable=self.progress_var)
         self.progress.grid(row=0, column=0, sticky='we')
         
-        self.progress_label = ttk.Label(progress_frame, text="Ready", style='TLabel')
+        self.progress_text_var = tk.StringVar(value="Ready")
+        self.progress_label = ttk.Label(progress_frame, textvariable=self.progress_text_var, style='TLabel')
         self.progress_label.grid(row=1, column=0, sticky='w', pady=(4, 0))
         
         btn_frame = ttk.Frame(frm)
@@ -99,6 +140,15 @@ class App(tk.Tk):
         self.logs_btn = ttk.Button(btn_frame, text="View Logs", command=self.view_logs)
         self.logs_btn.pack(side='left', padx=6)
 
+    def _drives(self, max_age=2.0):
+        """Return get_available_drives(), reusing a listing made in the last few seconds"""
+        t, v = self._drive_cache
+        now = time.monotonic()
+        if v is None or now - t > max_age:
+            v = get_available_drives()
+            self._drive_cache = (now, v)
+        return v
+
     def browse_file(self):
         path = filedialog.askopenfilename(
             title="Select file to wipe",
@@ -125,7 +175,7 @@ class App(tk.Tk):
 
     def browse_drives(self):
         try:
-            drives = get_available_drives()
+            drives = self._drives()
             if not drives:
                 messagebox.showwarning("No Drives", "No available drives found")
                 return
@@ -178,13 +228,11 @@ class App(tk.Tk):
             return
             
         # Check if it's a drive (Windows: C:\, D:\, etc. or Linux: /mnt/, etc.)
-        is_drive = False
-        if platform.system() == "Windows":
-            is_drive = len(path) == 3 and path[1] == ':' and path[2] == '\\'
-        else:
+        is_drive = _is_drive_path(path)
+        if not _IS_WIN:
             # Check if it's a mount point
             try:
-                drives = get_available_drives()
+                drives = self._drives()
                 is_drive = any(d['path'] == path for d in drives)
             except:
                 is_drive = False
@@ -223,34 +271,14 @@ Verification: {'Yes' if verify else 'No'}"""
             
         self.run_btn.configure(state='disabled')
         self._update_progress(0, "Starting wipe process...")
-        t = threading.Thread(target=self._do_wipe, daemon=True)
+        t = threading.Thread(target=self._do_wipe, args=(path, method, verify, is_drive), daemon=True)
         t.start()
 
     def _update_progress(self, value, text):
-        self.progress['value'] = value
-        self.progress_label['text'] = text
-        self.update_idletasks()
+        self.progress_var.set(value)
+        self.progress_text_var.set(text)
 
-    def _do_wipe(self):
-        path = self.path_var.get().strip()
-        method = self.method_var.get()
-        verify = self.verify_var.get()
-        
-        # Convert to absolute path and normalize
-        path = os.path.abspath(os.path.normpath(path))
-        
-        # Check if it's a drive (Windows: C:\, D:\, etc. or Linux: /mnt/, etc.)
-        is_drive = False
-        if platform.system() == "Windows":
-            is_drive = len(path) == 3 and path[1] == ':' and path[2] == '\\'
-        else:
-            # Check if it's a mount point
-            try:
-                drives = get_available_drives()
-                is_drive = any(d['path'] == path for d in drives)
-            except:
-                is_drive = False
-        
+    def _do_wipe(self, path, method, verify, is_drive):
         try:
             self._log(f"Starting wipe: {path} • method={method} • verify={verify}")
             self._update_progress(10, "Initializing wipe process...")
@@ -302,78 +330,108 @@ Verification: {'Yes' if verify else 'No'}"""
                         self._log(f"  - {error}")
             
             self._update_progress(80, "Generating certificate...")
-            cert_dir = os.path.join(os.path.expanduser('~'), 'DataWipingCertificates')
-            cert_path = os.path.join(cert_dir, f'certificate_{int(time.time())}.pdf')
+            cert_path = os.path.join(CERT_DIR, f'certificate_{int(time.time())}.pdf')
             payload = {
                 'target': path,
                 'method': method,
                 'verified': True,
                 'results': result,
             }
-            os.makedirs(cert_dir, exist_ok=True)
-            info = generate_certificate(cert_path, payload)
-            self._log(f"Certificate saved: {info['path']}")
+            os.makedirs(CERT_DIR, exist_ok=True)
+            self._log("Wipe finished, certificate is being generated in the background...")
             
-            # Log the operation
-            operation_data = {
-                'target': path,
-                'method': method,
-                'verified': True,
-                'success': True,
-                'results': result,
-                'certificate_path': info['path'],
-                'device_info': payload.get('device_info', {}),
-                'drive_info': payload.get('drive_info', {})
-            }
-            operation_id = self.logger.log_operation(operation_data)
-            self._log(f"Operation logged: {operation_id}")
-            
-            self._update_progress(100, "Data wiped successfully!")
-            self.cert_btn.configure(state='normal')
-            self.email_btn.configure(state='normal')
-            self.last_certificate_path = info['path']
-            
-            # Show success message
-            messagebox.showinfo("Success", "Data has been successfully wiped and certificate generated!")
+            # Build the PDF in a separate process; finish up on the Tk thread when it is done
+            fut = _cert_pool().submit(generate_certificate, cert_path, payload)
+            self._cert_jobs.append((fut, path, method, verify, result))
             
         except Exception as e:
-            self._log(f"Error: {e}")
-            self._update_progress(0, "Error occurred during wipe")
-            
-            # Log the failed operation
-            operation_data = {
-                'target': path,
-                'method': method,
-                'verified': verify,
-                'success': False,
-                'error': str(e),
-                'results': {},
-                'certificate_path': '',
-                'device_info': {},
-                'drive_info': {}
-            }
-            operation_id = self.logger.log_operation(operation_data)
-            self._log(f"Failed operation logged: {operation_id}")
-            
-            messagebox.showerror("Error", str(e))
-        finally:
+            self._on_wipe_failed(path, method, verify, e)
             self.run_btn.configure(state='normal')
 
+    def _poll_certs(self):
+        """Finish certificate jobs on the Tk thread once their worker is done"""
+        while self._cert_jobs and self._cert_jobs[0][0].done():
+            self._on_cert_done(*self._cert_jobs.popleft())
+        self.after(200, self._poll_certs)
+
+    def _on_cert_done(self, fut, path, method, verify, result):
+        """Record the operation once the background certificate generation has finished"""
+        # The next wipe may start only now that this one's certificate is settled
+        self.run_btn.configure(state='normal')
+        try:
+            info = fut.result()
+        except Exception as e:
+            self._on_wipe_failed(path, method, verify, e)
+            return
+        self._log(f"Certificate saved: {info['path']}")
+        
+        # Log the operation
+        operation_data = {
+            'target': path,
+            'method': method,
+            'verified': True,
+            'success': True,
+            'results': result,
+            'certificate_path': info['path'],
+            'device_info': {},
+            'drive_info': {}
+        }
+        operation_id = self.logger.log_operation(operation_data)
+        self._log(f"Operation logged: {operation_id}")
+        
+        self._update_progress(100, "Data wiped successfully!")
+        self.cert_btn.configure(state='normal')
+        self.email_btn.configure(state='normal')
+        self.last_certificate_path = info['path']
+        
+        # Show success message
+        messagebox.showinfo("Success", "Data has been successfully wiped and certificate generated!")
+
+    def _on_wipe_failed(self, path, method, verify, e):
+        """Report and log a wipe that failed"""
+        self._log(f"Error: {e}")
+        self._update_progress(0, "Error occurred during wipe")
+        
+        # Log the failed operation
+        operation_data = {
+            'target': path,
+            'method': method,
+            'verified': verify,
+            'success': False,
+            'error': str(e),
+            'results': {},
+            'certificate_path': '',
+            'device_info': {},
+            'drive_info': {}
+        }
+        operation_id = self.logger.log_operation(operation_data)
+        self._log(f"Failed operation logged: {operation_id}")
+        
+        messagebox.showerror("Error", str(e))
+
     def _log(self, msg):
-        self.log.insert('end', msg + "\n")
-        self.log.see('end')
+        self._log_queue.append(msg + "\n")
+
+    def _flush_log(self):
+        """Write queued log lines to the text widget in one insert"""
+        if self._log_queue:
+            chunks = []
+            while self._log_queue:
+                chunks.append(self._log_queue.popleft())
+            self.log.insert('end', ''.join(chunks))
+            self.log.see('end')
+        self.after(100, self._flush_log)
 
     def open_cert_dir(self):
-        cert_dir = os.path.join(os.path.expanduser('~'), 'DataWipingCertificates')
-        if not os.path.isdir(cert_dir):
-            os.makedirs(cert_dir, exist_ok=True)
-        import subprocess, sys
-        if sys.platform.startswith('win'):
-            os.startfile(cert_dir)
+        if not os.path.isdir(CERT_DIR):
+            os.makedirs(CERT_DIR, exist_ok=True)
+        import subprocess
+        if _IS_WIN:
+            os.startfile(CERT_DIR)
         elif sys.platform == 'darwin':
-            subprocess.call(['open', cert_dir])
+            subprocess.call(['open', CERT_DIR])
         else:
-            subprocess.call(['xdg-open', cert_dir])
+            subprocess.call(['xdg-open', CERT_DIR])
 
     def view_logs(self):
         """Open logs viewer window"""
@@ -410,19 +468,19 @@ Verification: {'Yes' if verify else 'No'}"""
             tree.heading(col, text=col)
             tree.column(col, width=150)
         
-        # Populate tree
+        # Build all rows first, then populate tree
+        rows = []
         for op in history:
-            status = "Success" if op.get('success', False) else "Failed"
-            verified = "Yes" if op.get('verified', False) else "No"
-            timestamp = op.get('timestamp', '')[:19]  # Remove microseconds
-            
-            tree.insert('', 'end', values=(
-                timestamp,
-                op.get('target', '')[:50] + '...' if len(op.get('target', '')) > 50 else op.get('target', ''),
+            tgt = op.get('target', '')
+            rows.append((
+                op.get('timestamp', '')[:19],  # Remove microseconds
+                (tgt[:50] + '...') if len(tgt) > 50 else tgt,
                 op.get('method', ''),
-                status,
-                verified
+                "Success" if op.get('success', False) else "Failed",
+                "Yes" if op.get('verified', False) else "No"
             ))
+        for row in rows:
+            tree.insert('', 'end', values=row)
         
         tree.pack(fill='both', expand=True)
         
@@ -451,8 +509,8 @@ Verification: {'Yes' if verify else 'No'}"""
     def open_log_dir(self):
         """Open log directory"""
         log_dir = self.logger.log_dir
-        import subprocess, sys
-        if sys.platform.startswith('win'):
+        import subprocess
+        if _IS_WIN:
             os.startfile(log_dir)
         elif sys.platform == 'darwin':
             subprocess.call(['open', log_dir])
@@ -1,8 +1,35 @@
-import json
 import os
+import struct
 import time
 from datetime import datetime
 from typing import Dict, List, Any
+from .utils import json_dumps, json_loads
+
+# Number of operations kept in the main history
+HISTORY_LIMIT = 100
+# Smallest size at which the append-only history is trimmed back to HISTORY_LIMIT entries;
+# after a trim it next rotates once it has doubled, so rotation stays amortized for large entries
+HISTORY_ROTATE_BYTES = 4 * 1024 * 1024
+# Fixed-width stats record: epoch timestamp, success flag, index into the header's stats_methods
+STATS_RECORD = struct.Struct('<d?H')
+
+def _tail_lines(path, n, block_size=64 * 1024):
+    """Return the last n non-empty lines of a file, reading backwards in blocks"""
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        blocks = []
+        newlines = 0
+        while pos > 0 and newlines <= n:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            block = f.read(step)
+            newlines += block.count(b'\n')
+            blocks.append(block)
+    data = b''.join(reversed(blocks))
+    lines = [ln for ln in data.split(b'\n') if ln.strip()]
+    return lines[-n:] if n > 0 else []
 
 class WipeLogger:
     """Comprehensive logging system for data wiping operations"""
@@ -13,32 +40,133 @@ class WipeLogger:
         self.log_dir = log_dir
         os.makedirs(self.log_dir, exist_ok=True)
         
-        # Create main log file
+        # Main log: a small header file plus an append-only JSONL history
         self.log_file = os.path.join(self.log_dir, 'wipe_history.json')
+        self.history_jsonl = os.path.join(self.log_dir, 'wipe_history.jsonl')
+        self.stats_file = os.path.join(self.log_dir, 'wipe_stats.bin')
         self.session_log = os.path.join(self.log_dir, f'session_{int(time.time())}.json')
+        self._history_cache = None
+        self._rotate_at = HISTORY_ROTATE_BYTES
+        self._stats_methods = None
         
         # Initialize log files if they don't exist
         if not os.path.exists(self.log_file):
             self._initialize_log_file()
+        elif not os.path.exists(self.history_jsonl):
+            self._migrate_main_log()
+        # Older sidecars stored method names inline; rebuild them against the method table
+        if not os.path.exists(self.stats_file) or self._load_stats_methods() is None:
+            self._rebuild_stats()
     
     def _initialize_log_file(self):
-        """Initialize the main log file with empty structure"""
+        """Initialize the main log header"""
         initial_data = {
-            'version': '1.0',
+            'version': '2.0',
             'created_at': datetime.now().isoformat(),
-            'total_operations': 0,
-            'operations': []
+            'history_file': os.path.basename(self.history_jsonl),
+            'stats_methods': []
         }
-        with open(self.log_file, 'w') as f:
-            json.dump(initial_data, f, indent=2)
+        with open(self.log_file, 'wb') as f:
+            f.write(json_dumps(initial_data))
+    
+    def _migrate_main_log(self):
+        """Move operations from an old single-file wipe_history.json into the JSONL history"""
+        try:
+            data = self._read_main_log()
+        except:
+            data = {}
+        operations = data.pop('operations', [])[-HISTORY_LIMIT:]
+        with open(self.history_jsonl, 'wb') as f:
+            f.write(b''.join(json_dumps(op) + b'\n' for op in operations))
+        data.pop('total_operations', None)
+        data.pop('last_updated', None)
+        data['version'] = '2.0'
+        data['history_file'] = os.path.basename(self.history_jsonl)
+        with open(self.log_file, 'wb') as f:
+            f.write(json_dumps(data))
+    
+    def _load_stats_methods(self):
+        """Method names the stats records index into, or None if the header has no table"""
+        try:
+            methods = self._read_main_log().get('stats_methods')
+        except:
+            return None
+        return methods if isinstance(methods, list) else None
+    
+    def _save_stats_methods(self):
+        """Store the method table in the main log header"""
+        try:
+            data = self._read_main_log()
+        except:
+            data = {}
+        data['stats_methods'] = self._stats_methods
+        with open(self.log_file, 'wb') as f:
+            f.write(json_dumps(data))
+    
+    def _method_id(self, method: str) -> int:
+        """Index of method in the stats method table, adding it on first use"""
+        if self._stats_methods is None:
+            self._stats_methods = self._load_stats_methods() or []
+        if method not in self._stats_methods:
+            self._stats_methods.append(method)
+            self._save_stats_methods()
+        return self._stats_methods.index(method)
+    
+    def _stats_record(self, log_entry: Dict[str, Any]) -> bytes:
+        """Pack the fields get_statistics needs into one fixed-width record"""
+        ts = log_entry.get('ts_epoch')
+        if ts is None:
+            # Entries logged before ts_epoch existed only carry the ISO string
+            try:
+                ts = datetime.fromisoformat(log_entry['timestamp']).timestamp()
+            except:
+                ts = 0.0
+        method_id = self._method_id(str(log_entry.get('method', 'unknown')))
+        return STATS_RECORD.pack(ts, bool(log_entry.get('success', False)), method_id)
+    
+    def _rebuild_stats(self):
+        """Regenerate the stats sidecar and its method table from the JSONL history"""
+        self._stats_methods = []
+        records = b''.join(self._stats_record(op) for op in self._recent_operations())
+        self._save_stats_methods()
+        with open(self.stats_file, 'wb') as f:
+            f.write(records)
+    
+    def _read_main_log(self) -> Dict[str, Any]:
+        """Read and parse the main log header"""
+        with open(self.log_file, 'rb', buffering=1 << 17) as f:
+            return json_loads(f.read())
+    
+    def _recent_operations(self, limit: int = HISTORY_LIMIT) -> List[Dict[str, Any]]:
+        """Parse the last `limit` operations (at most HISTORY_LIMIT) from the history"""
+        if limit <= 0 or limit > HISTORY_LIMIT:
+            limit = HISTORY_LIMIT
+        try:
+            st = os.stat(self.history_jsonl)
+        except FileNotFoundError:
+            return []
+        
+        # Re-parse only when the history file has changed since the last read
+        key = (st.st_mtime_ns, st.st_size)
+        if self._history_cache is None or self._history_cache[0] != key:
+            operations = []
+            for ln in _tail_lines(self.history_jsonl, HISTORY_LIMIT):
+                try:
+                    operations.append(json_loads(ln))
+                except ValueError:
+                    pass  # Skip a torn or corrupt line
+            self._history_cache = (key, operations)
+        return self._history_cache[1][-limit:]
     
     def log_operation(self, operation_data: Dict[str, Any]) -> str:
         """Log a complete wiping operation"""
-        operation_id = f"op_{int(time.time())}_{operation_data.get('method', 'unknown')}"
+        now = time.time()
+        operation_id = f"op_{int(now)}_{operation_data.get('method', 'unknown')}"
         
         log_entry = {
             'operation_id': operation_id,
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': datetime.fromtimestamp(now).isoformat(),
+            'ts_epoch': now,
             'target': operation_data.get('target', ''),
             'method': operation_data.get('method', ''),
             'verified': operation_data.get('verified', False),
@@ -59,80 +187,78 @@ class WipeLogger:
         return operation_id
     
     def _add_to_main_log(self, log_entry: Dict[str, Any]):
-        """Add entry to the main log file"""
-        try:
-            with open(self.log_file, 'r') as f:
-                data = json.load(f)
-        except:
-            data = {'operations': [], 'total_operations': 0}
+        """Append entry to the history in a single write"""
+        with open(self.history_jsonl, 'ab') as f:
+            f.write(json_dumps(log_entry) + b'\n')
+            size = f.tell()
+        self._history_cache = None
+        with open(self.stats_file, 'ab') as f:
+            f.write(self._stats_record(log_entry))
         
-        data['operations'].append(log_entry)
-        data['total_operations'] = len(data['operations'])
-        data['last_updated'] = datetime.now().isoformat()
-        
-        # Keep only last 100 operations in main log
-        if len(data['operations']) > 100:
-            data['operations'] = data['operations'][-100:]
-        
-        with open(self.log_file, 'w') as f:
-            json.dump(data, f, indent=2)
+        # Keep only last 100 operations, trimming lazily once the file has grown
+        if size > self._rotate_at:
+            self._rotate_history()
+    
+    def _rotate_history(self):
+        """Rewrite the history with only its last HISTORY_LIMIT entries"""
+        lines = _tail_lines(self.history_jsonl, HISTORY_LIMIT)
+        tmp_path = self.history_jsonl + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(b''.join(ln + b'\n' for ln in lines))
+            trimmed_size = f.tell()
+        os.replace(tmp_path, self.history_jsonl)
+        # Measured against the trimmed size, so large entries don't re-trigger a rotation every append
+        self._rotate_at = max(HISTORY_ROTATE_BYTES, 2 * trimmed_size)
+        self._rebuild_stats()
     
     def _create_operation_log(self, operation_id: str, log_entry: Dict[str, Any]):
-        """Create individual log file for this operation"""
-        op_log_file = os.path.join(self.log_dir, f'{operation_id}.json')
-        with open(op_log_file, 'w') as f:
-            json.dump(log_entry, f, indent=2)
+        """Append this operation to the current month's rolling log"""
+        rolling_log = os.path.join(self.log_dir, f'ops_{datetime.now():%Y%m}.jsonl')
+        with open(rolling_log, 'ab') as f:
+            f.write(json_dumps(log_entry) + b'\n')
     
     def get_operation_history(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get recent operation history"""
         try:
-            with open(self.log_file, 'r') as f:
-                data = json.load(f)
-            operations = data.get('operations', [])
-            return operations[-limit:] if limit > 0 else operations
+            return self._recent_operations(limit)
         except:
             return []
     
     def get_statistics(self) -> Dict[str, Any]:
         """Get wiping statistics"""
         try:
-            with open(self.log_file, 'r') as f:
-                data = json.load(f)
-            
-            operations = data.get('operations', [])
-            if not operations:
+            # Only the last HISTORY_LIMIT fixed-width records are needed
+            with open(self.stats_file, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - HISTORY_LIMIT * STATS_RECORD.size))
+                data = f.read()
+            data = data[len(data) % STATS_RECORD.size:]
+            if not data:
                 return {'total_operations': 0}
             
-            # Calculate statistics
-            total_ops = len(operations)
-            successful_ops = len([op for op in operations if op.get('success', False)])
-            failed_ops = total_ops - successful_ops
-            
-            # Method usage
+            # Calculate statistics in a single pass over the records
+            total_ops = successful_ops = recent_ops = 0
             method_counts = {}
-            for op in operations:
-                method = op.get('method', 'unknown')
-                method_counts[method] = method_counts.get(method, 0) + 1
-            
-            # Recent activity (last 7 days)
-            recent_ops = []
             week_ago = time.time() - (7 * 24 * 60 * 60)
-            for op in operations:
-                try:
-                    op_time = datetime.fromisoformat(op['timestamp']).timestamp()
-                    if op_time > week_ago:
-                        recent_ops.append(op)
-                except:
-                    pass
+            methods = self._load_stats_methods() or []
+            for ts, ok, method_id in STATS_RECORD.iter_unpack(data):
+                total_ops += 1
+                successful_ops += ok
+                if ts > week_ago:
+                    recent_ops += 1
+                method = methods[method_id] if method_id < len(methods) else 'unknown'
+                method_counts[method] = method_counts.get(method, 0) + 1
+            failed_ops = total_ops - successful_ops
             
+            last = self._recent_operations(1)
             return {
                 'total_operations': total_ops,
                 'successful_operations': successful_ops,
                 'failed_operations': failed_ops,
                 'success_rate': (successful_ops / total_ops * 100) if total_ops > 0 else 0,
                 'method_usage': method_counts,
-                'recent_operations_7days': len(recent_ops),
-                'last_operation': operations[-1]['timestamp'] if operations else None
+                'recent_operations_7days': recent_ops,
+                'last_operation': last[-1]['timestamp'] if last else None
             }
         except:
             return {'total_operations': 0}
@@ -140,19 +266,36 @@ class WipeLogger:
     def export_logs(self, output_path: str, format: str = 'json'):
         """Export logs to a file"""
         try:
-            with open(self.log_file, 'r') as f:
-                data = json.load(f)
+            try:
+                data = self._read_main_log()
+            except:
+                data = {}
+            data.pop('stats_methods', None)  # Internal to the stats sidecar
+            operations = self._recent_operations()
+            data['total_operations'] = len(operations)
+            data['operations'] = operations
+            if operations:
+                data['last_updated'] = operations[-1].get('timestamp')
             
             if format.lower() == 'json':
-                with open(output_path, 'w') as f:
-                    json.dump(data, f, indent=2)
+                with open(output_path, 'wb') as f:
+                    f.write(json_dumps(data, indent=True))
             elif format.lower() == 'csv':
-                import csv
-                with open(output_path, 'w', newline='') as f:
-                    if data.get('operations'):
-                        writer = csv.DictWriter(f, fieldnames=data['operations'][0].keys())
-                        writer.writeheader()
-                        writer.writerows(data['operations'])
+                # pandas' C writer is much faster on large exports; imported lazily as it is optional
+                try:
+                    import pandas as pd
+                except ImportError:
+                    pd = None
+                
+                if pd is not None and data.get('operations'):
+                    pd.DataFrame(data['operations']).to_csv(output_path, index=False)
+                else:
+                    import csv
+                    with open(output_path, 'w', newline='') as f:
+                        if data.get('operations'):
+                            writer = csv.DictWriter(f, fieldnames=data['operations'][0].keys())
+                            writer.writeheader()
+                            writer.writerows(data['operations'])
             else:
                 raise ValueError(f"Unsupported format: {format}")
             
@@ -167,11 +310,17 @@ class WipeLogger:
             cutoff_time = time.time() - (days_to_keep * 24 * 60 * 60)
             removed_count = 0
             
-            for filename in os.listdir(self.log_dir):
-                if filename.startswith('op_') and filename.endswith('.json'):
-                    file_path = os.path.join(self.log_dir, filename)
-                    if os.path.getmtime(file_path) < cutoff_time:
-                        os.remove(file_path)
+            # Monthly ops_YYYYMM.jsonl files, plus per-operation op_*.json from older versions
+            with os.scandir(self.log_dir) as entries:
+                for entry in entries:
+                    name = entry.name
+                    if not name.startswith('op'):
+                        continue
+                    if not ((name.startswith('ops_') and name.endswith('.jsonl')) or
+                            (name.startswith('op_') and name.endswith('.json'))):
+                        continue
+                    if entry.stat(follow_symlinks=False).st_mtime < cutoff_time:
+                        os.remove(entry.path)
                         removed_count += 1
             
             return removed_count
@@ -1,20 +1,106 @@
-import hashlib, os, random, time
+import hashlib, os, random, struct, threading, time, zlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    import json
+    ORJSON_AVAILABLE = False
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+    CRYPTOGRAPHY_AVAILABLE = True
+except ImportError:
+    CRYPTOGRAPHY_AVAILABLE = False
 
-def sha256_file(path, chunk_size=1024*1024):
-    h = hashlib.sha256()
-    with open(path, 'rb') as f:
+# Bytes drawn from one AES-CTR key before it is replaced with a fresh os.urandom seed
+RNG_RESEED_BYTES = 1 << 30
+_rng_state = threading.local()
+
+def sha256_file(path, chunk_size=4*1024*1024):
+    """Return the SHA-256 hex digest of a file"""
+    with open(path, 'rb', buffering=0) as f:
+        if hasattr(os, 'posix_fadvise'):
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        # hashlib.file_digest (3.11+) streams into OpenSSL with a reused buffer
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        h = hashlib.new('sha256')
+        buf = bytearray(chunk_size)
+        view = memoryview(buf)
         while True:
-            chunk = f.read(chunk_size)
-            if not chunk:
+            n = f.readinto(buf)
+            if not n:
                 break
-            h.update(chunk)
+            h.update(view[:n])
     return h.hexdigest()
 
+def json_dumps(obj, indent=False):
+    """Serialize obj to UTF-8 JSON bytes, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+def json_loads(data):
+    """Parse JSON from bytes or str, using orjson when it is installed"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
 def file_size(path):
     return os.path.getsize(path)
 
+def _aes_ctr_stream(n):
+    """Per-thread AES-128-CTR keystream state, seeded from os.urandom and reseeded periodically"""
+    st = _rng_state
+    if getattr(st, 'encryptor', None) is None or st.used + n > RNG_RESEED_BYTES:
+        # AES-128's 10 rounds run ~20% faster than AES-256's 14 through OpenSSL's VAES/AES-NI CTR code
+        seed = os.urandom(32)
+        st.encryptor = Cipher(algorithms.AES(seed[:16]), modes.CTR(seed[16:])).encryptor()
+        st.used = 0
+    st.used += n
+    if len(getattr(st, 'zeros', b'')) < n:
+        st.zeros = bytes(n)
+    return st
+
+def reseed_random():
+    """Make the calling thread's next random bytes come from a freshly keyed AES-CTR stream"""
+    _rng_state.encryptor = None
+
 def secure_random_bytes(n):
-    return os.urandom(n)
+    """Unpredictable bytes for wipe patterns: AES-CTR keystream when cryptography is installed, else os.urandom"""
+    if not CRYPTOGRAPHY_AVAILABLE:
+        return os.urandom(n)
+    st = _aes_ctr_stream(n)
+    return st.encryptor.update(memoryview(st.zeros)[:n])
+
+_URANDOM = None
+
+def secure_random_bytes_into(buf):
+    """Fill a writable buffer with random bytes in place, without allocating a new bytes object"""
+    global _URANDOM
+    view = memoryview(buf).cast('B')
+    if CRYPTOGRAPHY_AVAILABLE:
+        # update_into needs 15 bytes of headroom in the output, so the last few come from update()
+        n = len(view)
+        st = _aes_ctr_stream(n)
+        head = max(0, n - 15)
+        if head:
+            st.encryptor.update_into(memoryview(st.zeros)[:head], view)
+        view[head:] = st.encryptor.update(memoryview(st.zeros)[:n - head])
+        return
+    if _URANDOM is None:
+        try:
+            _URANDOM = open('/dev/urandom', 'rb', buffering=0)
+        except OSError:
+            _URANDOM = False  # e.g. Windows
+    if not _URANDOM:
+        view[:] = os.urandom(len(view))
+        return
+    filled = 0
+    while filled < len(view):
+        filled += _URANDOM.readinto(view[filled:])
 
 def random_pattern_byte():
     return random.randint(0, 255).to_bytes(1, 'little')
@@ -57,16 +143,18 @@ def verify_file_erasure(file_path, original_hash=None, sample_size=1024):
             samples_verified = 0
             total_samples = min(10, max(1, file_size // sample_size))
             
-            for _ in range(total_samples):
-                # Random position in file
-                pos = random.randint(0, max(0, file_size - sample_size))
+            # Draw every sample offset from a single urandom call, in file order
+            span = max(0, file_size - sample_size) + 1
+            offsets = sorted(v % span for v in struct.unpack(f'<{total_samples}Q', os.urandom(8 * total_samples)))
+            
+            for pos in offsets:
                 f.seek(pos)
                 chunk = f.read(sample_size)
                 
                 # Check if chunk contains only zeros or random data (not original content)
                 if len(chunk) == sample_size:
-                    # Simple heuristic: check if chunk is all zeros or has high entropy
-                    if chunk == b'\x00' * sample_size or len(set(chunk)) > sample_size // 4:
+                    # Simple heuristic: all zeros, or high entropy (random data doesn't compress)
+                    if not chunk.strip(b'\x00') or len(zlib.compress(chunk, 1)) > sample_size * 0.9:
                         samples_verified += 1
             
             verification_results['sampling_verified'] = (samples_verified >= total_samples * 0.8)
@@ -99,22 +187,29 @@ def verify_drive_erasure(drive_path, sample_files=None):
         
         # If specific files provided, check them
         if sample_files:
-            for file_path in sample_files:
-                if os.path.exists(file_path):
-                    verification_results['files_checked'] += 1
-                    # For drive verification, we mainly check if files are gone
-                    if not os.path.exists(file_path):
-                        verification_results['files_verified'] += 1
+            # For drive verification, we mainly check if files are gone
+            verification_results['files_checked'] = len(sample_files)
+            verification_results['files_verified'] = sum(1 for file_path in sample_files if not os.path.exists(file_path))
         else:
-            # Check a sample of remaining files
+            # Check a sample of remaining files: first 5 per directory, at most 20 in total
             remaining_files = []
-            for root, dirs, files in os.walk(drive_path):
-                remaining_files.extend([os.path.join(root, f) for f in files[:5]])  # Sample first 5 files per directory
-                if len(remaining_files) >= 20:  # Limit to 20 files for performance
-                    break
+            pending = [drive_path]
+            while pending and len(remaining_files) < 20:
+                per_dir = 0
+                try:
+                    with os.scandir(pending.pop()) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending.append(entry.path)
+                            elif per_dir < 5:
+                                remaining_files.append(entry.path)
+                                per_dir += 1
+                except OSError:
+                    continue  # Unreadable directory, as os.walk would skip it
             
+            # Every sampled file was just listed, so none of them count as wiped
             verification_results['files_checked'] = len(remaining_files)
-            verification_results['files_verified'] = len([f for f in remaining_files if not os.path.exists(f)])
+            verification_results['files_verified'] = 0
     
     except Exception as e:
         verification_results['error'] = str(e)